@@ -0,0 +1,137 @@
+"""Jądra numeryczne dla karty statystyk opisowych.
+
+Trzymane w osobnym module, żeby numba mogła trwale cache'ować
+skompilowany kod (``cache=True`` wymaga stabilnego pliku źródłowego).
+Bez numby działa czysto-NumPy'owy odpowiednik.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba jest opcjonalna
+    njit = None
+
+
+def _raw_moments_loop(x):
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    m3 = 0.0
+    m4 = 0.0
+    mn = np.inf
+    mx = -np.inf
+    for v in x:
+        v = float(v)
+        n1 = n
+        n += 1
+        delta = v - mean
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term1 = delta * delta_n * n1
+        mean += delta_n
+        m4 += (
+            term1 * delta_n2 * (n * n - 3 * n + 3)
+            + 6.0 * delta_n2 * m2
+            - 4.0 * delta_n * m3
+        )
+        m3 += term1 * delta_n * (n - 2) - 3.0 * delta_n * m2
+        m2 += term1
+        if v < mn:
+            mn = v
+        if v > mx:
+            mx = v
+    return n, mean, m2, m3, m4, mn, mx
+
+
+def _raw_moments_numpy(x):
+    n = x.size
+    mean = float(x.mean())
+    d = x.astype(np.float64) - mean
+    d2 = d * d
+    m2 = float(d2.sum())
+    m3 = float((d2 * d).sum())
+    m4 = float((d2 * d2).sum())
+    return n, mean, m2, m3, m4, float(x.min()), float(x.max())
+
+
+if njit is not None:
+    _raw_moments = njit(cache=True, fastmath=True)(_raw_moments_loop)
+else:
+    _raw_moments = _raw_moments_numpy
+
+# Stan „pustego zbioru" — punkt startowy dla akumulacji przyrostowej.
+EMPTY_STATE = (0, 0.0, 0.0, 0.0, 0.0, float("inf"), float("-inf"))
+
+
+def raw_moments(x: np.ndarray) -> tuple:
+    """Surowe akumulatory ``(n, mean, M2, M3, M4, min, max)`` dla ``x``."""
+    if x.size == 0:
+        return EMPTY_STATE
+    return tuple(_raw_moments(x))
+
+
+def combine(a: tuple, b: tuple) -> tuple:
+    """Łączy dwa stany surowych momentów (formuły równoległe Pébaya).
+
+    Dzięki temu statystyki aktualizuje się o samą dokładkę nowych
+    wierszy, zamiast przeliczać cały zbiór od zera.
+    """
+    na, mean_a, m2a, m3a, m4a, mn_a, mx_a = a
+    nb, mean_b, m2b, m3b, m4b, mn_b, mx_b = b
+    if na == 0:
+        return b
+    if nb == 0:
+        return a
+    n = na + nb
+    delta = mean_b - mean_a
+    mean = mean_a + delta * nb / n
+    m2 = m2a + m2b + delta * delta * na * nb / n
+    m3 = (
+        m3a + m3b
+        + delta ** 3 * na * nb * (na - nb) / (n * n)
+        + 3.0 * delta * (na * m2b - nb * m2a) / n
+    )
+    m4 = (
+        m4a + m4b
+        + delta ** 4 * na * nb * (na * na - na * nb + nb * nb) / (n ** 3)
+        + 6.0 * delta * delta * (na * na * m2b + nb * nb * m2a) / (n * n)
+        + 4.0 * delta * (na * m3b - nb * m3a) / n
+    )
+    return n, mean, m2, m3, m4, min(mn_a, mn_b), max(mx_a, mx_b)
+
+
+def finalize(state: tuple) -> tuple[float, float, float, float, float, float]:
+    """Średnia, wariancja (nieobciążona), skośność, kurtoza nadwyżkowa
+    (poprawki jak w scipy ``bias=False``), min i max — ze stanu surowego."""
+    n, mean, m2, m3, m4, mn, mx = state
+    var = m2 / (n - 1) if n > 1 else float("nan")
+    if n > 2 and m2 > 0:
+        g1 = (m3 / n) / (m2 / n) ** 1.5
+        skewness = g1 * (n * (n - 1)) ** 0.5 / (n - 2)
+    else:
+        skewness = float("nan")
+    if n > 3 and m2 > 0:
+        g2 = n * m4 / (m2 * m2) - 3.0
+        excess_kurt = ((n + 1) * g2 + 6.0) * (n - 1) / ((n - 2) * (n - 3))
+    else:
+        excess_kurt = float("nan")
+    return mean, var, skewness, excess_kurt, mn, mx
+
+
+def moments(x: np.ndarray) -> tuple[float, float, float, float, float, float]:
+    """Jednoprzebiegowe momenty całej tablicy (``finalize(raw_moments(x))``)."""
+    return finalize(raw_moments(x))
+
+
+def median(x: np.ndarray) -> float:
+    """Mediana przez ``np.partition`` (introselect, O(N)) — rysowanie nie
+    potrzebuje pełnego porządku, więc sort O(N log N) jest zbędny."""
+    n = x.size
+    if n == 0:
+        return float("nan")
+    h = n // 2
+    if n % 2:
+        return float(np.partition(x, h)[h])
+    part = np.partition(x, [h - 1, h])
+    return (float(part[h - 1]) + float(part[h])) / 2.0
@@ -1,21 +1,20 @@
 import html
+import io
 import sqlite3
 import threading
-from datetime import datetime
+import time
+from collections import deque
 from pathlib import Path
 
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
-from scipy.stats import gaussian_kde, kurtosis, skew
 import streamlit as st
-from streamlit_autorefresh import st_autorefresh
+
+from _stats_kernels import EMPTY_STATE, combine, finalize, median, moments, raw_moments
 
 # ------------- Konfiguracja podstawowa -------------
 st.set_page_config(page_title="Żywy histogram (Streamlit)", page_icon="📊", layout="wide")
 
-st.markdown(
-    """
+_CSS = """
     <style>
     :root {
         --gradient-primary: linear-gradient(135deg, #4250e3, #b347e6);
@@ -157,7 +156,7 @@ st.markdown(
         font-size: clamp(1.25rem, 2.6vw, 1.6rem);
         font-weight: 700;
     }
-    .stPlotlyChart, .stVegaLiteChart, .stPyplot {
+    .stPlotlyChart, .stVegaLiteChart, .stPyplot, .stImage {
         border-radius: 1.15rem !important;
         padding: 1.25rem !important;
         background: var(--surface-strong);
@@ -173,61 +172,340 @@ st.markdown(
         margin: 1.4rem 0;
     }
     </style>
-    """,
-    unsafe_allow_html=True,
-)
+    """
 
-DB_PATH = Path("data.db")
-DB_LOCK = threading.Lock()
 
+@st.cache_resource(show_spinner=False)
+def _inject_css():
+    # st.cache_resource odtwarza elementy z cache'u, więc arkusz jest
+    # serializowany raz, a nie wysyłany od nowa przy każdym rerunie.
+    st.markdown(_CSS, unsafe_allow_html=True)
+
+
+_inject_css()
+
+DB_PATH = Path("data.db")
 
-def get_conn():
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+# Nie globalna blokada bazy — WAL pozwala czytać równolegle z zapisem, więc
+# odczyty idą bez żadnego muteksu. Ten pilnuje wyłącznie stanu transakcji
+# współdzielonego połączenia (BEGIN/COMMIT nie może się przeplatać między
+# wątkiem flushera a wątkami skryptu).
+_TXN_LOCK = threading.Lock()
+
+# Jeden tekst SQL dla wszystkich insertów — sqlite3 trzyma skompilowaną
+# formę w cache'u instrukcji, o ile tekst jest identyczny. Timestamp
+# nadaje DEFAULT kolumny, więc bindujemy wyłącznie wartość.
+_INSERT_SQL = "INSERT INTO entries(value) VALUES(?)"
+
+# Unix-ms liczone po stronie SQLite (julianday 2440587.5 = epoka uniksowa).
+_TS_MS_DEFAULT = "CAST((julianday('now') - 2440587.5) * 86400000 AS INTEGER)"
+
+
+@st.cache_resource(show_spinner=False)
+def get_conn() -> sqlite3.Connection:
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=128)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+    conn.execute("PRAGMA cache_size=-65536")  # 64 MiB stron w pamięci
     conn.execute(
-        """
+        f"""
         CREATE TABLE IF NOT EXISTS entries(
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             value REAL NOT NULL,
-            created_at TEXT NOT NULL
+            ts_ms INTEGER NOT NULL DEFAULT ({_TS_MS_DEFAULT})
         )
         """
     )
+    cols = {row[1] for row in conn.execute("PRAGMA table_info(entries)")}
+    if "created_at" in cols:
+        # Migracja starych baz: tekstowy timestamp -> unix-ms w INTEGER.
+        if "ts_ms" not in cols:
+            conn.execute("ALTER TABLE entries ADD COLUMN ts_ms INTEGER")
+        conn.execute(
+            "UPDATE entries"
+            " SET ts_ms = CAST(strftime('%s', created_at) AS INTEGER) * 1000"
+            " WHERE ts_ms IS NULL"
+        )
+        conn.execute("ALTER TABLE entries DROP COLUMN created_at")
+        conn.commit()
+    (ddl,) = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type='table' AND name='entries'"
+    ).fetchone()
+    if "DEFAULT" not in ddl:
+        # SQLite nie umie dołożyć DEFAULT istniejącej kolumnie — przebudowa
+        # tabeli (jednorazowa, przy pierwszym połączeniu po aktualizacji).
+        conn.executescript(
+            f"""
+            BEGIN;
+            CREATE TABLE entries_new(
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                value REAL NOT NULL,
+                ts_ms INTEGER NOT NULL DEFAULT ({_TS_MS_DEFAULT})
+            );
+            INSERT INTO entries_new(id, value, ts_ms)
+                SELECT id, value, ts_ms FROM entries;
+            DROP TABLE entries;
+            ALTER TABLE entries_new RENAME TO entries;
+            COMMIT;
+            """
+        )
+    # Indeks pokrywający (id, value): odczyty przyrostowe i LIMIT-owane
+    # odpowiadamy z samych stron indeksu, bez dotykania wierszy z ts_ms.
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_entries_id_value ON entries(id, value)"
+    )
+    conn.execute("ANALYZE")
+    # Rozgrzewka cache'u instrukcji, żeby pierwszy insert nie parsował SQL-a.
+    conn.execute("EXPLAIN " + _INSERT_SQL, (0.0,)).fetchall()
     return conn
 
 
-def add_value(v: float):
-    with DB_LOCK:
+# Bufor zapisu: wpisy lądują w kolejce, a wątek w tle co 200 ms wrzuca je
+# do bazy jednym executemany/commit (jeden fsync na paczkę zamiast na wiersz).
+_WRITE_QUEUE: deque[float] = deque()
+_FLUSH_INTERVAL = 0.2
+
+
+def _flush_writes():
+    batch = []
+    while True:
+        try:
+            batch.append(_WRITE_QUEUE.popleft())
+        except IndexError:
+            break
+    if not batch:
+        return
+    with _TXN_LOCK:
         conn = get_conn()
-        conn.execute(
-            "INSERT INTO entries(value, created_at) VALUES(?, ?)",
-            (float(v), datetime.utcnow().isoformat()),
-        )
-        conn.commit()
-        conn.close()
+        # BEGIN IMMEDIATE bierze blokadę zapisu z góry; przy innym procesie
+        # piszącym czeka busy_timeout zamiast rzucać "database is locked".
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(_INSERT_SQL, [(v,) for v in batch])
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+
+@st.cache_resource(show_spinner=False)
+def _start_flusher() -> threading.Thread:
+    def run():
+        while True:
+            time.sleep(_FLUSH_INTERVAL)
+            _flush_writes()
+
+    t = threading.Thread(target=run, daemon=True, name="entries-flusher")
+    t.start()
+    return t
+
+
+def add_value(v: float):
+    _WRITE_QUEUE.append(float(v))
+    # Od razu spróbuj spłukać — klikający widzi swój wpis w tym samym rerunie,
+    # a przy naporze jeden commit i tak zabiera całą zaległą kolejkę.
+    _flush_writes()
 
 
 def clear_values():
-    with DB_LOCK:
+    _WRITE_QUEUE.clear()
+    with _TXN_LOCK:
         conn = get_conn()
         conn.execute("DELETE FROM entries")
         conn.commit()
-        conn.close()
 
 
-def read_values(limit: int | None = None) -> pd.DataFrame:
-    with DB_LOCK:
-        conn = get_conn()
-        if limit:
-            df = pd.read_sql_query(
-                "SELECT * FROM entries ORDER BY id DESC LIMIT ?",
-                conn,
-                params=(limit,),
-            )
-            df = df.iloc[::-1].reset_index(drop=True)
-        else:
-            df = pd.read_sql_query("SELECT * FROM entries ORDER BY id ASC", conn)
-        conn.close()
-    return df
+def _probe() -> tuple[int, int]:
+    count, max_id = get_conn().execute(
+        "SELECT COUNT(*), COALESCE(MAX(id), 0) FROM entries"
+    ).fetchone()
+    return int(count), int(max_id)
+
+
+def read_recent(n: int = 10) -> list[float]:
+    """Ostatnie n wartości, od najnowszej — dokładnie tak, jak renderują żetony."""
+    rows = get_conn().execute(
+        "SELECT value FROM entries ORDER BY id DESC LIMIT ?", (n,)
+    ).fetchall()
+    return [r[0] for r in rows]
+
+
+def _load_values() -> np.ndarray:
+    _flush_writes()  # zaległe wpisy z kolejki trafiają do bazy przed sondą
+    count, max_id = _probe()
+    buf = st.session_state.get("x_buf")
+    n_have = st.session_state.get("x_n", 0)
+    last_id = st.session_state.get("last_id", 0)
+    state = st.session_state.get("moments", EMPTY_STATE)
+    if buf is None or count == 0 or count - n_have != max_id - last_id:
+        # Pierwszy rerun w sesji albo reset ćwiczenia — budujemy od zera.
+        # Po resecie AUTOINCREMENT nadaje id dalej od sqlite_sequence, więc
+        # max_id nigdy nie cofa się poniżej last_id; pokolenie poznajemy po
+        # ciągłości id — w zsynchronizowanej sesji przyrost COUNT musi być
+        # równy przyrostowi MAX(id), inaczej bufor trzyma stare ćwiczenie.
+        buf = np.empty(256, dtype=np.float32)
+        n_have = 0
+        last_id = 0
+        state = EMPTY_STATE
+    # Budżet dokładki z zakresu id, nie z delty COUNT: (last_id, max_id]
+    # mieści co najwyżej max_id - last_id wierszy, więc nawet przy
+    # rozjechanym stanie sesji pętla nie wyjdzie poza pojemność bufora.
+    n_new = max_id - last_id
+    if n_new > 0:
+        need = n_have + n_new
+        if need > buf.size:
+            # Podwajanie pojemności amortyzuje kopiowanie do O(1) na wiersz —
+            # zamiast realokacji przy każdej dokładce (np.concatenate).
+            cap = buf.size
+            while cap < need:
+                cap *= 2
+            grown = np.empty(cap, dtype=np.float32)
+            grown[:n_have] = buf[:n_have]
+            buf = grown
+        # Górna granica id zamraża migawkę na stan z sondy; fetchmany
+        # amortyzuje konwersję C->Python, a wiersze lądują wprost w buforze.
+        cur = get_conn().execute(
+            "SELECT value FROM entries WHERE id > ? AND id <= ? ORDER BY id",
+            (last_id, max_id),
+        )
+        cur.arraysize = 1024
+        i = n_have
+        while chunk := cur.fetchmany():
+            for (v,) in chunk:
+                buf[i] = v
+                i += 1
+        # Momenty domykamy samą dokładką — O(Δ) zamiast O(N) na rerun.
+        state = combine(state, raw_moments(buf[n_have:i]))
+        n_have = i
+        last_id = max_id
+    st.session_state["x_buf"] = buf
+    st.session_state["x_n"] = n_have
+    st.session_state["last_id"] = last_id
+    st.session_state["moments"] = state
+    return buf[:n_have]
+
+
+@st.cache_data(show_spinner=False)
+def _hist_counts(last_id: int, bins: int, _x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    counts, edges = np.histogram(_x, bins=bins)
+    return counts, edges
+
+
+def _fft_kde(x: np.ndarray, gridsize: int = 500) -> tuple[np.ndarray, np.ndarray]:
+    n = x.size
+    sd = float(x.std())
+    q75, q25 = np.percentile(x, [75, 25])
+    sigma = min(sd, (q75 - q25) / 1.349) or sd or 1.0
+    h = 0.9 * sigma * n ** (-0.2)  # reguła Silvermana
+    counts, edges = np.histogram(x, bins=gridsize, range=(float(x.min()) - 3 * h, float(x.max()) + 3 * h))
+    dx = edges[1] - edges[0]
+    centers = edges[:-1] + 0.5 * dx
+    m = max(int(np.ceil(4.0 * h / dx)), 1)
+    kernel = np.exp(-0.5 * ((np.arange(-m, m + 1) * dx) / h) ** 2)
+    kernel /= kernel.sum()
+    nfft = 1 << (gridsize + kernel.size - 1).bit_length()
+    smooth = np.fft.irfft(
+        np.fft.rfft(counts, nfft) * np.fft.rfft(kernel, nfft), nfft
+    )[m : m + gridsize]
+    return centers, smooth / (n * dx)
+
+
+@st.cache_resource(show_spinner=False)
+def _warm_kernels() -> bool:
+    # Wymusza kompilację numby i pierwsze FFT raz na proces, zanim
+    # przyjdą prawdziwe dane. Dtype musi zgadzać się z produkcją —
+    # numba specjalizuje per sygnaturę, a bufor sesji jest float32.
+    moments(np.zeros(4, dtype=np.float32))
+    _fft_kde(np.arange(4, dtype=np.float32))
+    return True
+
+
+@st.cache_data(show_spinner=False)
+def _kde_curve(
+    last_id: int, bins: int, bin_width: float, _x: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    xs, density = _fft_kde(_x)
+    # Gęstość -> oczekiwane liczebności przy danej szerokości koszyka histogramu.
+    return xs, density * _x.size * bin_width
+
+
+# Jedna figura na proces ⇒ jeden rysujący naraz: matplotlib nie jest
+# bezpieczny wątkowo, a fragmenty różnych sesji renderują równolegle.
+_FIG_LOCK = threading.Lock()
+
+
+@st.cache_resource(show_spinner=False)
+def _box_fig():
+    # Import dopiero tutaj: matplotlib kosztuje setki ms na zimnym
+    # starcie, a potrzebny jest wyłącznie dla boxplota. Jedna figura
+    # na proces — tworzenie Figure/Axes (lokatory, fonty) jest droższe
+    # niż samo rysowanie.
+    import matplotlib.pyplot as plt
+
+    fig = plt.figure(figsize=(8, 4.8))
+    fig.add_subplot(111)
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def _box_stats(last_id: int, _x: np.ndarray) -> dict:
+    """Kwartyle, wąsy (whis=1.5, jak w ax.boxplot) i obserwacje odstające
+    policzone raz na sygnaturę danych — ax.bxp dostaje gotowy słownik
+    i tylko rysuje, bez własnego liczenia statystyk w Pythonie."""
+    q1, med, q3 = (float(q) for q in np.quantile(_x, [0.25, 0.5, 0.75]))
+    iqr = q3 - q1
+    inside = _x[(_x >= q1 - 1.5 * iqr) & (_x <= q3 + 1.5 * iqr)]
+    whislo = float(inside.min()) if inside.size else q1
+    whishi = float(inside.max()) if inside.size else q3
+    fliers = _x[(_x < whislo) | (_x > whishi)]
+    return {
+        "med": med,
+        "q1": q1,
+        "q3": q3,
+        "whislo": whislo,
+        "whishi": whishi,
+        "fliers": fliers.astype(np.float64),
+    }
+
+
+@st.cache_data(show_spinner=False)
+def _boxplot_png(last_id: int, var_label: str, _x: np.ndarray) -> bytes:
+    """Boxplot jako gotowe bajty PNG — bezczynny tick autoodświeżania
+    odtwarza obraz z cache'u zamiast przechodzić rasteryzację matplotliba."""
+    with _FIG_LOCK:
+        fig = _box_fig()
+        fig.patch.set_facecolor("white")
+        ax = fig.axes[0]
+        ax.cla()
+        ax.set_facecolor("white")
+        ax.spines["top"].set_visible(False)
+        ax.spines["right"].set_visible(False)
+        ax.tick_params(colors="#1a2242")
+        ax.title.set_color("#1a2242")
+        ax.xaxis.label.set_color("#1a2242")
+        ax.yaxis.label.set_color("#1a2242")
+        ax.bxp(
+            [_box_stats(last_id, _x)],
+            vert=False,
+            patch_artist=True,
+            boxprops=dict(facecolor="#dbe1ff", color="#3a49c0", linewidth=2),
+            medianprops=dict(color="#1a2242", linewidth=2.2),
+            whiskerprops=dict(color="#3a49c0", linewidth=1.6),
+            capprops=dict(color="#3a49c0", linewidth=1.6),
+            flierprops=dict(markerfacecolor="#ffffff", markeredgecolor="#3a49c0"),
+        )
+        ax.set_title(f"Boxplot — {var_label}")
+        ax.set_xlabel(var_label)
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png", dpi=144)
+        return buf.getvalue()
+
+
+_warm_kernels()
+_start_flusher()
 
 
 # ------------- Sidebar (sterowanie) -------------
@@ -251,6 +529,39 @@ def format_value(value: float | int | None, decimals: int = 3) -> str:
     return formatted if formatted else "0"
 
 
+@st.cache_data(show_spinner=False)
+def _render_stats_html(last_id: int, moments_state: tuple, _x: np.ndarray) -> str:
+    mean, var, skewness, excess_kurt, x_min, x_max = finalize(moments_state)
+    stats = {
+        "N": int(_x.size),
+        "Mean": mean,
+        "Median": median(_x),
+        "Variance": var,
+        "SD": var ** 0.5 if _x.size > 1 else np.nan,
+        "Skewness": skewness,
+        "Kurtosis (excess)": excess_kurt,
+        "Min": x_min,
+        "Max": x_max,
+    }
+    stat_precision = {
+        "N": 0,
+        "Mean": 2,
+        "Median": 2,
+        "Variance": 3,
+        "SD": 2,
+        "Skewness": 3,
+        "Kurtosis (excess)": 3,
+        "Min": 2,
+        "Max": 2,
+    }
+    items = "".join(
+        f"<li><span class='label'>{label}</span>"
+        f"<span class='value'>{format_value(value, stat_precision.get(label, 3))}</span></li>"
+        for label, value in stats.items()
+    )
+    return f"<div class='stat-card'><ul class='stat-list'>{items}</ul></div>"
+
+
 with st.sidebar:
     st.header("⚙️ Ustawienia")
     var_label = st.text_input("Etykieta zmiennej", value="Godziny snu")
@@ -268,7 +579,9 @@ with st.sidebar:
     with col_add2:
         refresh_btn = st.button("🔄 Odśwież teraz", use_container_width=True)
 
-    recent_box = st.container()
+    # st.empty: fragment podmienia zawartość w miejscu, bez dublowania
+    # elementów przy kolejnych odświeżeniach fragmentu.
+    recent_box = st.empty()
 
     st.divider()
     plot_type = st.radio("Rodzaj wykresu", options=["Histogram", "Boxplot"], horizontal=True)
@@ -317,25 +630,6 @@ if refresh_btn:
     except AttributeError:
         st.experimental_rerun()
 
-if auto_refresh:
-    st_autorefresh(interval=2000, limit=None, key="auto_refresh_key")
-
-# ------------- Dane -------------
-df = read_values()
-x = df["value"].to_numpy(dtype=float) if not df.empty else np.array([])
-
-with recent_box:
-    st.markdown("<p class='metric-subheader'>🗒️ Ostatnie wartości</p>", unsafe_allow_html=True)
-    if df.empty:
-        st.write("—")
-    else:
-        recent_values = df.tail(10)["value"].tolist()
-        items = "".join(
-            f"<span>{format_value(v, 2)}</span>"
-            for v in reversed(recent_values)
-        )
-        st.markdown(f"<div class='recent-values'>{items}</div>", unsafe_allow_html=True)
-
 # ------------- Nagłówek -------------
 var_label_display = html.escape(var_label)
 st.markdown(
@@ -343,104 +637,112 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-# ------------- Główna siatka -------------
-left, right = st.columns([2, 1], gap="large")
-
-with left:
-    st.markdown("<div class='panel-card visual-panel'>", unsafe_allow_html=True)
-    st.subheader("Wizualizacja")
-    if x.size == 0:
-        st.info("Brak danych. Poproś studentów o wpisanie pierwszych wartości po lewej stronie.")
-    else:
-        fig = plt.figure(figsize=(8, 4.8))
-        fig.patch.set_facecolor("white")
-        ax = plt.gca()
-        ax.set_facecolor("white")
-        ax.spines["top"].set_visible(False)
-        ax.spines["right"].set_visible(False)
-        ax.tick_params(colors="#1a2242")
-        ax.title.set_color("#1a2242")
-        ax.xaxis.label.set_color("#1a2242")
-        ax.yaxis.label.set_color("#1a2242")
-
-        if plot_type == "Histogram":
-            ax.hist(x, bins=bins, edgecolor="#1a2242", color="#8796ff")
-            ax.set_title(f"Histogram — {var_label}")
-            ax.set_xlabel(var_label)
-            ax.set_ylabel("Liczebność")
-
-            if show_density and x.size >= 2 and np.all(np.isfinite(x)):
+# ------------- Żywa część strony (fragment) -------------
+@st.fragment(run_every=2.0 if auto_refresh else None)
+def _live_view():
+    # ------------- Dane -------------
+    x = _load_values()
+
+    with recent_box.container():
+        st.markdown("<p class='metric-subheader'>🗒️ Ostatnie wartości</p>", unsafe_allow_html=True)
+        recent_values = read_recent(10)
+        if not recent_values:
+            st.write("—")
+        else:
+            # Stały format %.2f wystarcza dla żetonów; format_value z obcinaniem
+            # zer zostaje dla karty statystyk.
+            items = "".join("<span>%.2f</span>" % v for v in recent_values)
+            st.markdown(f"<div class='recent-values'>{items}</div>", unsafe_allow_html=True)
+
+    # ------------- Główna siatka -------------
+    left, right = st.columns([2, 1], gap="large")
+
+    with left:
+        st.markdown("<div class='panel-card visual-panel'>", unsafe_allow_html=True)
+        st.subheader("Wizualizacja")
+        if x.size == 0:
+            st.info("Brak danych. Poproś studentów o wpisanie pierwszych wartości po lewej stronie.")
+        elif plot_type == "Histogram":
+            # Przeglądarka rysuje sama (Vega-Lite) — serwer wysyła tylko koszyki,
+            # bez rasteryzacji PNG w matplotlibie przy każdym odświeżeniu.
+            last_id = st.session_state.get("last_id", 0)
+            counts, edges = _hist_counts(last_id, bins, x)
+            bars = [
+                {"x0": float(e0), "x1": float(e1), "y": int(c)}
+                for e0, e1, c in zip(edges[:-1], edges[1:], counts)
+            ]
+            layers = [
+                {
+                    "data": {"values": bars},
+                    "mark": {"type": "bar", "fill": "#8796ff", "stroke": "#1a2242"},
+                    "encoding": {
+                        "x": {
+                            "field": "x0",
+                            "type": "quantitative",
+                            "title": var_label,
+                            "axis": {"labelColor": "#1a2242", "titleColor": "#1a2242"},
+                        },
+                        "x2": {"field": "x1"},
+                        "y": {
+                            "field": "y",
+                            "type": "quantitative",
+                            "title": "Liczebność",
+                            "axis": {"labelColor": "#1a2242", "titleColor": "#1a2242"},
+                        },
+                    },
+                }
+            ]
+            if show_density and x.size >= 2:
                 try:
-                    kde = gaussian_kde(x)
-                    xs = np.linspace(x.min(), x.max(), 500)
-                    ys = kde(xs)
-                    counts, _ = np.histogram(x, bins=bins)
-                    scale = counts.max() / ys.max() if ys.max() > 0 else 1.0
-                    ax.plot(xs, ys * scale, linewidth=2, color="#4b3ae0")
+                    xs, ys = _kde_curve(last_id, bins, float(edges[1] - edges[0]), x)
+                    layers.append(
+                        {
+                            "data": {
+                                "values": [
+                                    {"x": float(a), "y": float(b)} for a, b in zip(xs, ys)
+                                ]
+                            },
+                            "mark": {"type": "line", "color": "#4b3ae0", "strokeWidth": 2},
+                            "encoding": {
+                                "x": {"field": "x", "type": "quantitative"},
+                                "y": {"field": "y", "type": "quantitative"},
+                            },
+                        }
+                    )
                 except Exception:
                     pass
-
-        else:  # Boxplot
-            ax.boxplot(
-                x,
-                vert=False,
-                whis=1.5,
-                patch_artist=True,
-                boxprops=dict(facecolor="#dbe1ff", color="#3a49c0", linewidth=2),
-                medianprops=dict(color="#1a2242", linewidth=2.2),
-                whiskerprops=dict(color="#3a49c0", linewidth=1.6),
-                capprops=dict(color="#3a49c0", linewidth=1.6),
-                flierprops=dict(markerfacecolor="#ffffff", markeredgecolor="#3a49c0"),
+            st.vega_lite_chart(
+                {
+                    "title": {"text": f"Histogram — {var_label}", "color": "#1a2242"},
+                    "height": 360,
+                    "background": "white",
+                    "layer": layers,
+                },
+                use_container_width=True,
+            )
+        else:  # Boxplot — zostaje na matplotlibie
+            # Klucz (last_id, etykieta) nie zmienia się między bezczynnymi
+            # tikami, więc st.image dostaje te same bajty z cache'u.
+            png = _boxplot_png(st.session_state.get("last_id", 0), var_label, x)
+            st.image(png, use_column_width=True)
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    with right:
+        st.subheader("Statystyki opisowe")
+        if x.size == 0:
+            st.write("—")
+        else:
+            st.markdown(
+                _render_stats_html(
+                    st.session_state.get("last_id", 0),
+                    st.session_state.get("moments", EMPTY_STATE),
+                    x,
+                ),
+                unsafe_allow_html=True,
             )
-            ax.set_title(f"Boxplot — {var_label}")
-            ax.set_xlabel(var_label)
 
-        st.pyplot(fig, use_container_width=True)
-    st.markdown("</div>", unsafe_allow_html=True)
 
-with right:
-    st.subheader("Statystyki opisowe")
-    if x.size == 0:
-        st.write("—")
-    else:
-        stats = {}
-        stats["N"] = int(x.size)
-        stats["Mean"] = np.nanmean(x)
-        stats["Median"] = np.nanmedian(x)
-        stats["Variance"] = np.nanvar(x, ddof=1) if x.size > 1 else np.nan
-        stats["SD"] = np.nanstd(x, ddof=1) if x.size > 1 else np.nan
-        stats["Skewness"] = skew(x, bias=False) if x.size > 2 else np.nan
-        stats["Kurtosis (excess)"] = kurtosis(x, fisher=True, bias=False) if x.size > 3 else np.nan
-        stats["Min"] = np.nanmin(x)
-        stats["Max"] = np.nanmax(x)
-
-        stat_precision = {
-            "N": 0,
-            "Mean": 2,
-            "Median": 2,
-            "Variance": 3,
-            "SD": 2,
-            "Skewness": 3,
-            "Kurtosis (excess)": 3,
-            "Min": 2,
-            "Max": 2,
-        }
-
-        stat_items = []
-        for key, value in stats.items():
-            decimals = stat_precision.get(key, 3)
-            display_value = format_value(value, decimals)
-            stat_items.append((key, display_value))
-
-        st.markdown(
-            "<div class='stat-card'><ul class='stat-list'>" +
-            "".join(
-                f"<li><span class='label'>{label}</span><span class='value'>{val}</span></li>"
-                for label, val in stat_items
-            ) +
-            "</ul></div>",
-            unsafe_allow_html=True,
-        )
+_live_view()
 
 st.divider()
 with st.expander("ℹ️ Informacje techniczne / prywatność"):